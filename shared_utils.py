@@ -0,0 +1,62 @@
+import copy
+import functools
+import re
+import threading
+from typing import Callable, TypeVar
+
+
+_T = TypeVar('_T')
+
+# "Patient: ..." transcript lines; group 1 is the stripped, non-empty
+# statement. [^\S\n] is whitespace other than a newline, so matches never run
+# across lines.
+PATIENT_LINE_RE = re.compile(
+    r"^[^\S\n]*patient:[^\S\n]*(\S(?:.*\S)?)[^\S\n]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def lazy_singleton(factory: Callable[[], _T]) -> Callable[[], _T]:
+    """
+    Turn a zero-argument factory into a getter for one process-wide instance.
+
+    The factory runs on the first call only, for objects whose construction
+    (model loads) dominates the cost of a single call. A lock serializes the
+    first calls so concurrent callers never build two instances; if the
+    factory raises, the next call tries again.
+    """
+    build = functools.lru_cache(maxsize=1)(factory)
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get() -> _T:
+        with lock:
+            return build()
+
+    return get
+
+
+def memoize_copies(maxsize: int) -> Callable[[Callable[..., _T]], Callable[..., _T]]:
+    """
+    Memoize a deterministic function and hand out deep copies of its results.
+
+    Results are cached per (hashable) argument tuple, so repeated inputs
+    (evaluation loops, replays) cost one lookup plus the copy. Because every
+    caller gets its own copy, mutating a result never alters the cache.
+    cache_info() and cache_clear() are passed through from the lru_cache.
+
+    Args:
+        maxsize: Max distinct inputs remembered
+    """
+    def decorator(func: Callable[..., _T]) -> Callable[..., _T]:
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+
+        @functools.wraps(func)
+        def wrapper(*args) -> _T:
+            return copy.deepcopy(cached(*args))
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    return decorator
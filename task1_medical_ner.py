@@ -1,10 +1,128 @@
  
 
 import spacy
-from spacy.matcher import PhraseMatcher
+import bisect
 import re
-from typing import Dict, List
+import sys
+import threading
+from typing import Dict, List, Optional
 import json
+from shared_utils import lazy_singleton, memoize_copies
+
+
+# Pipeline components the extractors never read (doc.ents, lemmas, cats).
+# The tagger, attribute_ruler and parser stay: noun_chunks needs POS + deps.
+# Nothing else depends on the parse; sentences are split with _SENT_BOUNDARY_RE.
+_UNUSED_PIPES = ["ner", "lemmatizer", "textcat"]
+
+# Regex patterns are compiled once at import instead of on every call.
+_MONTHS = (r'(January|February|March|April|May|June|July|August|September|October|'
+           r'November|December)')
+
+# Alternatives that used to be tried one re.search at a time are joined into
+# a single pattern so the text is scanned once. The callers keep the original
+# priority: an earlier alternative anywhere in the text beats a later one,
+# and among matches of the same alternative the leftmost wins.
+
+# Patient name and incident date share one scan of the original text.
+# Patient name (case-sensitive): capture titles and optional first+last names
+# Examples: "Ms. Jones", "Ms Jones", "Janet Jones", "My name is Janet Jones"
+# It is a zero-width lookahead so a name never consumes text a date could use.
+# Incident date or month-year mentions (case-insensitive; "on <Month> <day>" is
+# covered by the first alternative, "last <Month>" only applies when no day
+# follows)
+_PATIENT_INFO_RE = re.compile(
+    r'(?=(?P<title>Ms\.|Mr\.|Mrs\.)\s+(?P<surname>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)'
+    r'|My name is\s+(?P<full_name>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))'
+    r'|(?i:(?P<month_day>' + _MONTHS + r'\s+\d{1,2}(?:st|nd|rd|th)?)'
+    r'|(?P<last_month>last\s+' + _MONTHS + r'(?!\s+\d))'
+    r'|(?P<time>\b\d{1,2}:\d{2}\b\s*(?:am|pm)?))'  # time of day
+)
+# Last group of each _PATIENT_INFO_RE alternative -> (field, priority)
+_PATIENT_INFO_RANKS = {
+    'surname': ('patient_name', 0),
+    'full_name': ('patient_name', 1),
+    'month_day': ('incident_date', 0),
+    'last_month': ('incident_date', 1),
+    'time': ('incident_date', 2),
+}
+
+# Durations, timeframes and current-status cues, matched against the
+# lowercased text in one scan. A duration preceded by "within"/"in" is also
+# a timeframe (unless it counts sessions); status cues are plain literals.
+_TEMPORAL_RE = re.compile(
+    r'(?:(?P<within>within|in)\s+)?(?P<num>\d+)\s+'
+    r'(?P<unit>week|weeks|month|months|day|days|session|sessions)'
+    r'|(?P<status>occasional|no longer|resolved|still|continuing)'
+)
+# Status cue -> current_status, in priority order
+_STATUS_CUES = (
+    (('occasional',), 'Occasional symptoms'),
+    (('no longer', 'resolved'), 'Resolved'),
+    (('still', 'continuing'), 'Ongoing')
+)
+_PROG_TIMEFRAME_RE = re.compile(r'within\s+(\d+)\s+(week|weeks|month|months|day|days)')
+
+# Keyword sets scanned with one multi-pattern regex instead of a Python
+# `any(kw in text for kw in ...)` loop per sentence / noun chunk
+_PROGNOSIS_KEYWORDS_RE = re.compile(r'recovery|prognosis|expect|improve|heal', re.IGNORECASE)
+# Sentence boundaries: whitespace after terminal punctuation, or a line break.
+# Honorifics ("Ms. Jones") do not end a sentence.
+_SENT_BOUNDARY_RE = re.compile(r'(?<=[.!?])(?<!\b(?:Mr|Ms|Dr)\.)(?<!\bMrs\.)\s+|\s*\n\s*')
+_MEDICAL_INDICATORS_RE = re.compile(
+    r'pain|injury|therapy|treatment|session|accident|recovery|diagnosis|symptom',
+    re.IGNORECASE
+)
+
+# Medical terminology patterns for entity recognition
+_MEDICAL_TERMS = {
+    'SYMPTOM': [
+        'pain', 'discomfort', 'stiffness', 'ache', 'soreness', 'hurt',
+        'trouble sleeping', 'backache', 'neck pain', 'back pain',
+        'head impact', 'shock', 'anxiety', 'nervous'
+    ],
+    'TREATMENT': [
+        'physiotherapy', 'painkillers', 'treatment', 'therapy',
+        'x-ray', 'x-rays', 'medical attention', 'analgesics',
+        'sessions', 'advice'
+    ],
+    'DIAGNOSIS': [
+        'whiplash', 'injury', 'strain', 'whiplash injury',
+        'lower back strain', 'damage', 'degeneration'
+    ],
+    'BODY_PART': [
+        'neck', 'back', 'head', 'spine', 'steering wheel',
+        'cervical', 'lumbar', 'muscles'
+    ]
+}
+
+# The vocabulary matcher is built once per process and shared by every
+# MedicalNER instance. It runs on the raw lowercased text (no spaCy Doc
+# needed); longer terms come first so "back pain" is reported instead of
+# "back" + "pain". Terms are interned so entity sets hold canonical strings.
+_TERM_LABELS = {sys.intern(term): label for label, terms in _MEDICAL_TERMS.items() for term in terms}
+# Formatter cues carried as bit flags per vocabulary term, so the summary
+# formatters test one OR-ed mask instead of re-scanning the entity lists
+_FLAG_PAIN = 1
+_FLAG_PHYSIO = 2
+_FLAG_PAINKILLER = 4
+
+
+def _term_flags(term: str, label: str) -> int:
+    flags = 0
+    if label == 'SYMPTOM' and ('pain' in term or 'ache' in term):
+        flags |= _FLAG_PAIN
+    if label == 'TREATMENT' and 'physio' in term:
+        flags |= _FLAG_PHYSIO
+    if label == 'TREATMENT' and ('painkiller' in term or 'analgesic' in term):
+        flags |= _FLAG_PAINKILLER
+    return flags
+
+
+_TERM_FLAGS = {term: _term_flags(term, label) for term, label in _TERM_LABELS.items()}
+_TERM_MATCHER = re.compile(
+    r'\b(?:' + '|'.join(re.escape(term) for term in sorted(_TERM_LABELS, key=len, reverse=True)) + r')\b'
+)
 
 
 class MedicalNER:
@@ -13,17 +131,48 @@ class MedicalNER:
     Implements exactly what's required in Task 1.
     """
     
-    def __init__(self):
-        """Initialize NLP model (prefer scispaCy; fallback to spaCy) and matcher."""
-        self.nlp = self._load_nlp()
-        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        self._setup_medical_patterns()
+    def __init__(self, mode: str = "accurate", lazy: bool = True):
+        """
+        Initialize NLP model (prefer scispaCy; fallback to spaCy).
+        
+        Args:
+            mode: "accurate" loads a trained pipeline so keywords include medical
+                  noun phrases; "fast" uses a blank English tokenizer, which
+                  loads in milliseconds and draws keywords from the medical
+                  vocabulary only
+            lazy: Defer loading the spaCy pipeline until it is first needed.
+                  Entity, temporal and summary extraction are regex-based, so
+                  only extract_keywords ever triggers the load
+        """
+        if mode not in ("fast", "accurate"):
+            raise ValueError(f"mode must be 'fast' or 'accurate', got {mode!r}")
+        self.mode = mode
+        self._nlp = None
+        self._nlp_lock = threading.Lock()
+        if not lazy:
+            self._nlp = self._load_nlp()
+
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access."""
+        if self._nlp is None:
+            with self._nlp_lock:
+                if self._nlp is None:
+                    self._nlp = self._load_nlp()
+        return self._nlp
 
     def _load_nlp(self):
         """
         Try to load a scispaCy clinical/scientific model for better medical coverage.
         Fallback to spaCy 'en_core_web_sm' if unavailable.
+
+        Components listed in _UNUSED_PIPES are never loaded: only the tokenizer,
+        tagger/attribute_ruler and parser are used, for noun_chunks.
+        In "fast" mode no trained pipeline is loaded at all.
         """
+        if self.mode == "fast":
+            return spacy.blank("en")
+        
         preferred_models = [
             "en_core_sci_lg",  # scispaCy large scientific
             "en_core_sci_md",
@@ -31,59 +180,38 @@ class MedicalNER:
         ]
         for model in preferred_models:
             try:
-                return spacy.load(model)
+                return spacy.load(model, exclude=_UNUSED_PIPES)
             except Exception:
                 continue
         # Fallback to standard spaCy small English
-        return spacy.load("en_core_web_sm")
-    
-    def _setup_medical_patterns(self):
-        """Define medical terminology patterns for entity recognition."""
-        # Symptoms
-        symptoms = [
-            'pain', 'discomfort', 'stiffness', 'ache', 'soreness', 'hurt',
-            'trouble sleeping', 'backache', 'neck pain', 'back pain',
-            'head impact', 'shock', 'anxiety', 'nervous'
-        ]
-        
-        # Treatments
-        treatments = [
-            'physiotherapy', 'painkillers', 'treatment', 'therapy',
-            'x-ray', 'x-rays', 'medical attention', 'analgesics',
-            'sessions', 'advice'
-        ]
-        
-        # Diagnoses
-        diagnoses = [
-            'whiplash', 'injury', 'strain', 'whiplash injury',
-            'lower back strain', 'damage', 'degeneration'
-        ]
-        
-        # Body parts
-        body_parts = [
-            'neck', 'back', 'head', 'spine', 'steering wheel',
-            'cervical', 'lumbar', 'muscles'
-        ]
-        
-        # Add patterns to matcher
-        self.matcher.add('SYMPTOM', [self.nlp.make_doc(term) for term in symptoms])
-        self.matcher.add('TREATMENT', [self.nlp.make_doc(term) for term in treatments])
-        self.matcher.add('DIAGNOSIS', [self.nlp.make_doc(term) for term in diagnoses])
-        self.matcher.add('BODY_PART', [self.nlp.make_doc(term) for term in body_parts])
+        return spacy.load("en_core_web_sm", exclude=_UNUSED_PIPES)
     
-    def extract_entities(self, text: str) -> Dict[str, List[str]]:
+    def extract_entities(self, text: str, text_lower: Optional[str] = None) -> Dict[str, List[str]]:
         """
         DELIVERABLE 1: Named Entity Recognition (NER)
-        Extract Symptoms, Treatment, Diagnosis, Prognosis using spaCy
+        Extract Symptoms, Treatment, Diagnosis, Prognosis
+        
+        Works on the raw text: the vocabulary matcher and the prognosis
+        sentence scan are both regex-based, so no spaCy parse is needed.
         
         Args:
             text: Medical conversation transcript
+            text_lower: Optional pre-computed text.lower(), to avoid recomputing it
             
         Returns:
             Dictionary with Symptoms, Treatment, Diagnosis, Prognosis
         """
-        doc = self.nlp(text)
+        return self._extract_entities(text, text_lower)[0]
+    
+    def _extract_entities(self, text: str, text_lower: Optional[str] = None):
+        """
+        Implementation of extract_entities that also returns the OR of the
+        _TERM_FLAGS of every matched vocabulary term.
+        """
+        if text_lower is None:
+            text_lower = text.lower()
         
+        flags = 0
         entities = {
             'symptoms': set(),
             'treatments': set(),
@@ -91,130 +219,156 @@ class MedicalNER:
             'prognosis': set()
         }
         
-        # Use spaCy PhraseMatcher for medical entity recognition
-        matches = self.matcher(doc)
-        for match_id, start, end in matches:
-            label = self.nlp.vocab.strings[match_id]
-            span = doc[start:end]
+        # Match the medical vocabulary directly on the lowercased text
+        for m in _TERM_MATCHER.finditer(text_lower):
+            term = sys.intern(m.group())
+            label = _TERM_LABELS[term]
+            flags |= _TERM_FLAGS[term]
             
             if label == 'SYMPTOM':
-                entities['symptoms'].add(span.text.lower())
+                entities['symptoms'].add(term)
             elif label == 'TREATMENT':
-                entities['treatments'].add(span.text.lower())
+                entities['treatments'].add(term)
             elif label == 'DIAGNOSIS':
-                entities['diagnosis'].add(span.text.lower())
+                entities['diagnosis'].add(term)
+        
+        # Extract prognosis sentences: scan the whole text for prognosis
+        # keywords once, then map each hit to the sentence that owns it
+        hit_offsets = [m.start() for m in _PROGNOSIS_KEYWORDS_RE.finditer(text)]
+        if hit_offsets:
+            sent_starts = [0] + [m.end() for m in _SENT_BOUNDARY_RE.finditer(text)]
+            for i in {bisect.bisect_right(sent_starts, off) - 1 for off in hit_offsets}:
+                sent_end = sent_starts[i + 1] if i + 1 < len(sent_starts) else len(text)
+                entities['prognosis'].add(text[sent_starts[i]:sent_end].strip())
+        
+        return {k: sorted(list(v)) for k, v in entities.items()}, flags
+    
+    def extract_patient_info(self, text: str, text_lower: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extract patient name and other identifying information.
         
-        # Extract prognosis from sentences using spaCy
-        prognosis_keywords = ['recovery', 'prognosis', 'expect', 'improve', 'heal']
-        for sent in doc.sents:
-            if any(keyword in sent.text.lower() for keyword in prognosis_keywords):
-                entities['prognosis'].add(sent.text.strip())
+        Args:
+            text: Medical conversation transcript
+            text_lower: Optional pre-computed text.lower(), to avoid recomputing it
+        """
+        if text_lower is None:
+            text_lower = text.lower()
         
-        return {k: sorted(list(v)) for k, v in entities.items()}
-    
-    def extract_patient_info(self, text: str) -> Dict[str, str]:
-        """Extract patient name and other identifying information."""
         patient_info = {
             'patient_name': None,
             'incident_date': None,
             'incident_type': None
         }
         
-        # Extract patient name: capture titles and optional first+last names
-        # Examples: "Ms. Jones", "Ms Jones", "Janet Jones", "My name is Janet Jones"
-        name_patterns = [
-            r'(Ms\.|Mr\.|Mrs\.)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
-            r'My name is\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)'
-        ]
-        for pattern in name_patterns:
-            m = re.search(pattern, text)
-            if m:
-                if len(m.groups()) == 2:
-                    patient_info['patient_name'] = f"{m.group(1)} {m.group(2)}".strip()
-                else:
-                    patient_info['patient_name'] = m.group(1).strip()
-                break
-        
-        # Extract incident date or month-year mentions
-        date_patterns = [
-            r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?',
-            r'last\s+(January|February|March|April|May|June|July|August|September|October|November|December)',
-            r'on\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?',
-            r'(\b\d{1,2}:\d{2}\b\s*(am|pm)?)'  # time of day
-        ]
-        for pattern in date_patterns:
-            dm = re.search(pattern, text, flags=re.IGNORECASE)
-            if dm:
-                patient_info['incident_date'] = dm.group(0)
+        # Extract patient name and incident date in one scan, keeping the
+        # best-ranked (then leftmost) match for each field
+        best_rank = {'patient_name': None, 'incident_date': None}
+        for m in _PATIENT_INFO_RE.finditer(text):
+            field, rank = _PATIENT_INFO_RANKS[m.lastgroup]
+            if best_rank[field] is not None and best_rank[field] <= rank:
+                continue
+            best_rank[field] = rank
+            if m.lastgroup == 'surname':
+                patient_info[field] = f"{m.group('title')} {m.group('surname')}".strip()
+            elif m.lastgroup == 'full_name':
+                patient_info[field] = m.group('full_name').strip()
+            else:
+                patient_info[field] = m.group(m.lastgroup)
+            if best_rank['patient_name'] == 0 and best_rank['incident_date'] == 0:
                 break
         
         # Extract incident type
-        if 'car accident' in text.lower():
+        if 'car accident' in text_lower:
             patient_info['incident_type'] = 'Car accident'
-        elif 'accident' in text.lower():
+        elif 'accident' in text_lower:
             patient_info['incident_type'] = 'Accident'
         
         return patient_info
     
-    def extract_keywords(self, text: str) -> List[str]:
+    def extract_keywords(self, text: str, doc=None,
+                         entities: Optional[Dict[str, List[str]]] = None) -> List[str]:
         """
         DELIVERABLE 3: Keyword Extraction
         Identify important medical phrases (e.g., "whiplash injury", "physiotherapy sessions")
         
         Args:
             text: Medical conversation transcript
+            doc: Optional spaCy Doc already parsed from text
+            entities: Optional result of extract_entities(text), so callers that
+                      already extracted entities don't run the extraction twice
             
         Returns:
             List of important medical keywords and phrases
         """
-        doc = self.nlp(text)
         keywords = set()
         
-        # Extract medical noun phrases using spaCy
-        for chunk in doc.noun_chunks:
-            chunk_text = chunk.text.lower()
-            # Keep medically relevant phrases
-            medical_indicators = ['pain', 'injury', 'therapy', 'treatment', 'session', 
-                                'accident', 'recovery', 'diagnosis', 'symptom']
-            if any(indicator in chunk_text for indicator in medical_indicators):
-                keywords.add(chunk_text)
+        # Extract medical noun phrases using spaCy (needs the trained parser,
+        # so "fast" mode relies on the vocabulary entities below). Indicator
+        # words are located on the raw text first: without any, no noun chunk
+        # can qualify and the parse is skipped; otherwise only chunks spanning
+        # an indicator hit are checked.
+        if self.mode == "accurate":
+            hit_offsets = [m.start() for m in _MEDICAL_INDICATORS_RE.finditer(text)]
+            if hit_offsets:
+                if doc is None:
+                    doc = self.nlp(text)
+                for chunk in doc.noun_chunks:
+                    i = bisect.bisect_left(hit_offsets, chunk.start_char)
+                    if i == len(hit_offsets) or hit_offsets[i] >= chunk.end_char:
+                        continue
+                    chunk_text = chunk.text.lower()
+                    # Keep medically relevant phrases
+                    if _MEDICAL_INDICATORS_RE.search(chunk_text):
+                        keywords.add(chunk_text)
         
         # Add all extracted entities as keywords
-        entities = self.extract_entities(text)
+        if entities is None:
+            entities = self.extract_entities(text)
         for entity_list in entities.values():
             keywords.update(entity_list)
         
         return sorted(list(keywords))
     
-    def extract_temporal_info(self, text: str) -> Dict[str, str]:
-        """Extract temporal information (duration, timeline)."""
+    def extract_temporal_info(self, text: str, text_lower: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extract temporal information (duration, timeline).
+        
+        Args:
+            text: Medical conversation transcript
+            text_lower: Optional pre-computed text.lower(), to avoid recomputing it
+        """
+        if text_lower is None:
+            text_lower = text.lower()
         temporal_info = {}
         
-        # Extract duration patterns
-        duration_pattern = r'(\d+)\s+(week|weeks|month|months|day|days|session|sessions)'
-        durations = re.findall(duration_pattern, text.lower())
+        # Collect durations, the first timeframe of each kind and status cues
+        # in one pass
+        durations = []
+        timeframes = {}
+        status_cues = set()
+        for m in _TEMPORAL_RE.finditer(text_lower):
+            if m.group('status'):
+                status_cues.add(m.group('status'))
+                continue
+            duration = f"{m.group('num')} {m.group('unit')}"
+            durations.append(duration)
+            if m.group('within') and not m.group('unit').startswith('session'):
+                timeframes.setdefault(m.group('within'), duration)
+        # A "within" timeframe anywhere beats an "in" one
+        timeframe = timeframes.get('within') or timeframes.get('in')
         
         if durations:
-            temporal_info['treatment_duration'] = [f"{num} {unit}" for num, unit in durations]
+            temporal_info['treatment_duration'] = durations
         
-        # Extract timeframe/prognosis-style phrases
-        timeframe_patterns = [
-            r'within\s+(\d+)\s+(week|weeks|month|months|day|days)',
-            r'in\s+(\d+)\s+(week|weeks|month|months|day|days)'
-        ]
-        for pattern in timeframe_patterns:
-            tm = re.search(pattern, text.lower())
-            if tm:
-                temporal_info['timeframe'] = f"{tm.group(1)} {tm.group(2)}"
-                break
+        # Timeframe/prognosis-style phrase
+        if timeframe:
+            temporal_info['timeframe'] = timeframe
 
-        # Extract current status
-        if 'occasional' in text.lower():
-            temporal_info['current_status'] = 'Occasional symptoms'
-        elif 'no longer' in text.lower() or 'resolved' in text.lower():
-            temporal_info['current_status'] = 'Resolved'
-        elif 'still' in text.lower() or 'continuing' in text.lower():
-            temporal_info['current_status'] = 'Ongoing'
+        # Current status
+        for cues, status in _STATUS_CUES:
+            if not status_cues.isdisjoint(cues):
+                temporal_info['current_status'] = status
+                break
         
         return temporal_info
     
@@ -239,40 +393,45 @@ class MedicalNER:
         Returns:
             Structured JSON summary matching expected format
         """
+        # Lowercase once and share it with every helper
+        text_lower = conversation.lower()
+        
         # Extract all components using NER
-        patient_info = self.extract_patient_info(conversation)
-        entities = self.extract_entities(conversation)
-        temporal_info = self.extract_temporal_info(conversation)
+        patient_info = self.extract_patient_info(conversation, text_lower)
+        entities, flags = self._extract_entities(conversation, text_lower)
+        temporal_info = self.extract_temporal_info(conversation, text_lower)
         
         # Build structured summary in EXACT expected format
         summary = {
             "Patient_Name": patient_info.get('patient_name', 'Unknown'),
-            "Symptoms": self._format_symptoms(entities['symptoms'], conversation),
+            "Symptoms": self._format_symptoms(entities['symptoms'], text_lower, flags),
             "Diagnosis": self._format_diagnosis(entities['diagnosis'], conversation),
-            "Treatment": self._format_treatment(entities['treatments'], temporal_info),
-            "Current_Status": self._extract_current_status(conversation),
-            "Prognosis": self._format_prognosis(entities.get('prognosis', []), conversation)
+            "Treatment": self._format_treatment(entities['treatments'], temporal_info, flags),
+            "Current_Status": self._extract_current_status(text_lower),
+            "Prognosis": self._format_prognosis(entities.get('prognosis', []), text_lower)
         }
         
         return summary
     
-    def _format_symptoms(self, symptoms: List[str], text: str) -> List[str]:
+    def _format_symptoms(self, symptoms: List[str], text_lower: str, flags: int) -> List[str]:
         """Format and enhance symptom list with context."""
         formatted = []
-        text_lower = text.lower()
+        has_pain = flags & _FLAG_PAIN
         
         # Map generic symptoms to specific ones mentioned in text
-        if 'neck' in text_lower and any('pain' in s or 'ache' in s for s in symptoms):
+        if has_pain and 'neck' in text_lower:
             formatted.append('Neck pain')
-        if 'back' in text_lower and any('pain' in s or 'ache' in s for s in symptoms):
+        if has_pain and 'back' in text_lower:
             formatted.append('Back pain')
         if 'head' in text_lower and 'impact' in text_lower:
             formatted.append('Head impact')
         
-        # Add other symptoms
+        # Add other symptoms, skipping ones already covered above
+        formatted_lower = {f.lower() for f in formatted}
         for symptom in symptoms:
-            if symptom not in ['pain', 'ache'] and symptom not in ' '.join(formatted).lower():
+            if symptom not in ('pain', 'ache') and symptom not in formatted_lower:
                 formatted.append(symptom.capitalize())
+                formatted_lower.add(symptom)
         
         return formatted if formatted else ['Not specified']
     
@@ -284,29 +443,27 @@ class MedicalNER:
             return ', '.join([d.capitalize() for d in diagnoses])
         return 'Not specified'
     
-    def _format_treatment(self, treatments: List[str], temporal_info: Dict) -> List[str]:
+    def _format_treatment(self, treatments: List[str], temporal_info: Dict, flags: int) -> List[str]:
         """Format treatment information with duration."""
         formatted = []
         
         # Check for physiotherapy
-        if any('physio' in t for t in treatments):
+        if flags & _FLAG_PHYSIO:
             duration = temporal_info.get('treatment_duration', [])
-            physio_sessions = [d for d in duration if 'session' in d]
-            if physio_sessions:
-                formatted.append(f"{physio_sessions[0]} of physiotherapy")
+            physio_session = next((d for d in duration if 'session' in d), None)
+            if physio_session:
+                formatted.append(f"{physio_session} of physiotherapy")
             else:
                 formatted.append('Physiotherapy')
         
         # Check for painkillers
-        if any('painkiller' in t or 'analgesic' in t for t in treatments):
+        if flags & _FLAG_PAINKILLER:
             formatted.append('Painkillers')
         
         return formatted if formatted else ['Not specified']
     
-    def _extract_current_status(self, text: str) -> str:
+    def _extract_current_status(self, text_lower: str) -> str:
         """Extract current patient status."""
-        text_lower = text.lower()
-        
         if 'occasional' in text_lower and ('pain' in text_lower or 'ache' in text_lower):
             return 'Occasional backache'
         elif 'better' in text_lower or 'improving' in text_lower:
@@ -316,13 +473,13 @@ class MedicalNER:
         
         return 'Under observation'
     
-    def _format_prognosis(self, prognosis_entities: List[str], text: str) -> str:
+    def _format_prognosis(self, prognosis_entities: List[str], text_lower: str) -> str:
         """
         Format prognosis from NER entities and text analysis.
         
         Args:
             prognosis_entities: Prognosis sentences extracted by NER
-            text: Full conversation text
+            text_lower: Full conversation text, lowercased
             
         Returns:
             Formatted prognosis string
@@ -330,23 +487,22 @@ class MedicalNER:
         # If NER found prognosis sentences, use the most relevant one
         if prognosis_entities:
             for prog in prognosis_entities:
-                if 'recovery' in prog.lower() or 'expect' in prog.lower():
+                prog_lower = prog.lower()
+                if 'recovery' in prog_lower or 'expect' in prog_lower:
                     return prog
             return prognosis_entities[0]
         
         # Fallback to rule-based extraction
-        return self._extract_prognosis(text)
+        return self._extract_prognosis(text_lower)
     
-    def _extract_prognosis(self, text: str) -> str:
+    def _extract_prognosis(self, text_lower: str) -> str:
         """Extract prognosis information using rule-based approach."""
-        text_lower = text.lower()
-        
         if 'full recovery' in text_lower:
             # Try to extract timeframe
             if 'six months' in text_lower:
                 return 'Full recovery expected within six months'
             # Generic timeframe if present
-            tf = re.search(r'within\s+(\d+)\s+(week|weeks|month|months|day|days)', text_lower)
+            tf = _PROG_TIMEFRAME_RE.search(text_lower)
             if tf:
                 return f"Full recovery expected within {tf.group(1)} {tf.group(2)}"
             return 'Full recovery expected'
@@ -356,6 +512,24 @@ class MedicalNER:
         return 'Not specified'
 
 
+@lazy_singleton
+def _get_ner() -> MedicalNER:
+    """
+    Return the shared MedicalNER instance, loading it on first use.
+
+    The spaCy/scispaCy model is only loaded if keywords are requested.
+    Callers that process many conversations should reuse this instance
+    rather than creating their own MedicalNER.
+    """
+    return MedicalNER()
+
+
+@memoize_copies(maxsize=256)
+def _summary_cached(conversation: str) -> Dict:
+    """Structured summary of one conversation, built by the shared MedicalNER."""
+    return _get_ner().generate_structured_summary(conversation)
+
+
 def process_task1(conversation: str) -> Dict:
     """
     Main function to process Task 1: Medical NLP Summarization.
@@ -379,10 +553,23 @@ def process_task1(conversation: str) -> Dict:
           "Prognosis": "Full recovery expected within six months"
         }
     """
-    ner = MedicalNER()
+    return _summary_cached(conversation)
+
+
+def process_task1_batch(conversations: List[str]) -> List[Dict]:
+    """
+    Batch version of process_task1.
+    
+    The summary is built from regex/keyword extraction only (no spaCy parse),
+    so batching is a loop over the shared NER instance and its summary cache.
     
-    # Return the structured summary (which uses NER and keyword extraction internally)
-    return ner.generate_structured_summary(conversation)
+    Args:
+        conversations: Doctor-patient conversation transcripts
+        
+    Returns:
+        List of structured summaries, one per conversation
+    """
+    return [process_task1(conversation) for conversation in conversations]
 
 
 if __name__ == "__main__":
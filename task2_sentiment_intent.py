@@ -2,23 +2,202 @@
 
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 import torch
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
 import re
+import threading
+from shared_utils import PATIENT_LINE_RE, lazy_singleton
+
+# Optional ONNX Runtime backend (pip install optimum[onnxruntime])
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTOptimizer
+    from optimum.onnxruntime.configuration import OptimizationConfig
+except ImportError:
+    ORTModelForSequenceClassification = None
+
+# Optional fused-attention fast path for the PyTorch backend (pip install optimum)
+try:
+    from optimum.bettertransformer import BetterTransformer
+except ImportError:
+    BetterTransformer = None
+
+
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Longer statements are truncated by the tokenizer (not by characters)
+MAX_SEQUENCE_TOKENS = 512
+
+# Patient statements sent through the sentiment pipeline per forward pass
+SENTIMENT_BATCH_SIZE = 16
+
+# Max distinct statements remembered per analyzer, for each of sentiment and intent
+STATEMENT_CACHE_SIZE = 2048
+
+# Where exported (and graph-optimized) ONNX models are kept between runs
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "medical_nlp_toolkit", "onnx")
+
+# Returned for empty / very short text, which is not worth a model call
+_NEUTRAL_SENTIMENT = {
+    "sentiment": "Neutral",
+    "confidence": 0.0,
+    "raw_label": "NEUTRAL",
+    "raw_score": 0.0
+}
+
+
+def _bounded_put(cache: Dict, key, value):
+    """Insert into a size-capped dict cache, evicting the oldest entry when full."""
+    if len(cache) >= STATEMENT_CACHE_SIZE:
+        try:
+            del cache[next(iter(cache))]
+        except (KeyError, RuntimeError):
+            pass  # another thread evicted or inserted concurrently
+    cache[key] = value
 
 
 class SentimentIntentAnalyzer:
     """Analyze patient sentiment and intent from medical conversations."""
     
-    def __init__(self):
-        """Initialize sentiment analysis and intent detection models."""
+    def __init__(self, model_name: str = SENTIMENT_MODEL,
+                 compile_model: bool = False, reduced_precision: bool = False,
+                 use_onnx: bool = False, use_bettertransformer: bool = False):
+        """
+        Initialize sentiment analysis and intent detection models.
+        
+        Args:
+            model_name: Hugging Face sentiment classifier emitting POSITIVE /
+                        NEGATIVE labels. Defaults to DistilBERT SST-2; a
+                        smaller distilled SST-2 model is a faster drop-in,
+                        since the keyword rules decide most statements and
+                        the model only breaks ties above fixed thresholds
+            compile_model: Compile the sentiment model with torch.compile
+                           (mode="reduce-overhead") to cut per-call dispatch
+                           overhead. Compilation happens during construction
+                           and can take a minute; falls back to eager mode
+                           when torch.compile is unavailable or fails
+            reduced_precision: Run the sentiment model in FP16 on GPU, or with
+                               dynamically quantized int8 Linear layers on
+                               CPU. Faster, at the cost of slightly different
+                               confidence scores
+            use_onnx: Run the sentiment model on ONNX Runtime (requires
+                      optimum[onnxruntime]). The model is exported and
+                      graph-optimized once, then loaded from ONNX_CACHE_DIR.
+                      Falls back to PyTorch when optimum is not installed;
+                      compile_model, reduced_precision and
+                      use_bettertransformer only apply to the PyTorch backend
+            use_bettertransformer: Swap the model's attention layers for
+                                   PyTorch's fused fast path (scaled-dot-product
+                                   attention, no padding compute) via optimum's
+                                   BetterTransformer. Ignored when optimum is
+                                   not installed
+        """
         # Load pre-trained sentiment analysis model
-        self.sentiment_analyzer = pipeline(
+        self.model_name = model_name
+        ort_model = self._load_onnx_model(model_name) if use_onnx else None
+        if ort_model is not None:
+            self.backend = "onnx"
+            self.sentiment_analyzer = pipeline(
+                "sentiment-analysis",
+                model=ort_model,
+                tokenizer=AutoTokenizer.from_pretrained(model_name),
+                batch_size=SENTIMENT_BATCH_SIZE,
+                truncation=True,
+                max_length=MAX_SEQUENCE_TOKENS,
+                padding=False
+            )
+        else:
+            self.backend = "pytorch"
+            self.sentiment_analyzer = self._load_torch_pipeline(reduced_precision, use_bettertransformer)
+        
+        # Define intent patterns and sentiment keyword rules
+        self._setup_intent_patterns()
+        self._setup_sentiment_patterns()
+        
+        # Per-statement result caches (see clear_cache). Sentiment keys can
+        # ignore case only when the model's tokenizer lowercases anyway.
+        tokenizer = getattr(self.sentiment_analyzer, "tokenizer", None)
+        self._uncased = getattr(tokenizer, "do_lower_case", False)
+        self._sentiment_cache = {}
+        self._intent_cache = {}
+        
+        # Serializes pipeline calls: fast tokenizers are not safe to share
+        # across threads (see analyze_patient_dialogue_concurrent)
+        self._model_lock = threading.Lock()
+        
+        if compile_model and self.backend == "pytorch":
+            self._compile_model()
+    
+    def _load_torch_pipeline(self, reduced_precision: bool, use_bettertransformer: bool = False):
+        """
+        Build the PyTorch sentiment pipeline, optionally in reduced precision
+        and with BetterTransformer attention.
+        
+        Runs on the first GPU when CUDA is available, otherwise on CPU with
+        torch using every core.
+        """
+        use_cuda = torch.cuda.is_available()
+        pipeline_kwargs = {"device": 0 if use_cuda else -1}
+        if reduced_precision and use_cuda:
+            pipeline_kwargs["torch_dtype"] = torch.float16
+        if not use_cuda:
+            torch.set_num_threads(os.cpu_count() or 1)
+        
+        sentiment_analyzer = pipeline(
             "sentiment-analysis",
-            model="distilbert-base-uncased-finetuned-sst-2-english"
+            model=self.model_name,
+            batch_size=SENTIMENT_BATCH_SIZE,
+            truncation=True,
+            max_length=MAX_SEQUENCE_TOKENS,
+            padding=False,
+            **pipeline_kwargs
         )
+        if use_bettertransformer and BetterTransformer is not None:
+            try:
+                sentiment_analyzer.model = BetterTransformer.transform(sentiment_analyzer.model)
+            except (NotImplementedError, ValueError):
+                pass  # architecture or torch version unsupported; keep the stock layers
+        if reduced_precision and not use_cuda:
+            sentiment_analyzer.model = torch.quantization.quantize_dynamic(
+                sentiment_analyzer.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return sentiment_analyzer
+    
+    @staticmethod
+    def _load_onnx_model(model_name: str):
+        """
+        Load model_name on ONNX Runtime, exporting and optimizing it on first use.
         
-        # Define intent patterns
-        self._setup_intent_patterns()
+        Returns None when optimum[onnxruntime] is not installed.
+        """
+        if ORTModelForSequenceClassification is None:
+            return None
+        
+        export_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "--"))
+        optimized_file = "model_optimized.onnx"
+        if not os.path.isfile(os.path.join(export_dir, optimized_file)):
+            model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+            # Level 99 enables all ONNX Runtime graph fusions, including the
+            # transformer-specific attention / LayerNorm / GELU passes
+            ORTOptimizer.from_pretrained(model).optimize(
+                save_dir=export_dir,
+                optimization_config=OptimizationConfig(optimization_level=99)
+            )
+        return ORTModelForSequenceClassification.from_pretrained(export_dir, file_name=optimized_file)
+    
+    def _compile_model(self):
+        """Compile the sentiment model and warm it up, keeping eager mode on failure."""
+        if not hasattr(torch, "compile"):  # torch < 2.0
+            return
+        eager_model = self.sentiment_analyzer.model
+        try:
+            self.sentiment_analyzer.model = torch.compile(eager_model, mode="reduce-overhead")
+            # Trigger compilation now rather than on the first real request
+            self._run_model("warmup")
+        except Exception:
+            self.sentiment_analyzer.model = eager_model
     
     def _setup_intent_patterns(self):
         """Define patterns for intent detection."""
@@ -72,11 +251,79 @@ class SentimentIntentAnalyzer:
                 r'they (told|said|gave) me'
             ]
         }
+        
+        # Fuse each category into one compiled regex so a statement is scanned
+        # once per category. Every pattern sits in its own named lookahead, so
+        # matches never consume text and the distinct group names seen by
+        # finditer are exactly the patterns that would match on their own
+        # (no two patterns of one category can match at the same offset).
+        self.intent_regex = {
+            intent: re.compile(
+                "|".join(f"(?=(?P<p{i}>{p}))" for i, p in enumerate(patterns)),
+                re.IGNORECASE
+            )
+            for intent, patterns in self.intent_patterns.items()
+        }
+        # Fixed scoring order for detect_intent
+        self._intent_names = tuple(self.intent_regex)
+        self._intent_regexes = tuple(self.intent_regex.values())
+    
+    def _setup_sentiment_patterns(self):
+        """Define the keyword rules used to map model output to medical sentiment."""
+        # Anxiety / reassurance indicators, matched as whole words against the
+        # set of word tokens of the text (a token is a maximal \w+ run, which
+        # is exactly what \b...\b delimits)
+        self._word_re = re.compile(r"\w+")
+        self._anxiety_words = frozenset({'worried', 'concern', 'concerned', 'anxious', 'nervous', 'scared', 'afraid'})
+        self._reassurance_words = frozenset({'better', 'good', 'relief', 'thank', 'appreciate', 'helpful', 'manageable'})
+        # Multi-word reassurance phrases can't be a single token
+        self._reassurance_phrase_re = re.compile(r"\bunder control\b")
+        
+        # Simple negations that flip anxiety meaning (e.g., "not worried", "no longer worried")
+        self._negated_anxiety_res = [
+            re.compile(r"not (worried|concerned|anxious|nervous|scared|afraid)"),
+            re.compile(r"no longer (worried|concerned|anxious|nervous|scared|afraid)"),
+            re.compile(r"hardly (worried|concerned|anxious|nervous|scared|afraid)"),
+            re.compile(r"doesn't make me (worried|concerned|anxious|nervous|scared|afraid)"),
+            re.compile(r"does not make me (worried|concerned|anxious|nervous|scared|afraid)")
+        ]
+        
+        # Additional recovery/normalcy cues that imply reassurance even with some negative phrasing
+        # (plain substrings, searched for all at once with one escaped alternation)
+        recovery_phrases = (
+            'back to my usual routine',
+            'back to my routine',
+            'back to normal',
+            'returned to normal',
+            "hasn't really stopped me",
+            "hasn't stopped me",
+            "didn't really stop me",
+            "didn't stop me",
+            'no longer',
+            'able to do everything',
+            'doing everything as usual',
+            'recovered',
+            'improved',
+            'improving',
+            'getting better',
+            'better now',
+            'feels fine now',
+            'okay now',
+            'normal now',
+            'back at work',
+            'back to work'
+        )
+        self._recovery_re = re.compile("|".join(re.escape(p) for p in recovery_phrases))
     
     def analyze_sentiment(self, text: str) -> Dict:
         """
         Analyze sentiment of patient's text.
         
+        Statements that the keyword rules already decide are answered without
+        running the model; their raw_label is "RULE". Results are cached per
+        statement (ignoring surrounding whitespace, and case for uncased
+        models).
+        
         Args:
             text: Patient's dialogue text
             
@@ -84,90 +331,159 @@ class SentimentIntentAnalyzer:
             Dictionary with sentiment classification and confidence score
         """
         # Handle empty or very short text
-        if not text or len(text.strip()) < 3:
-            return {
-                "sentiment": "Neutral",
-                "confidence": 0.0,
-                "raw_label": "NEUTRAL",
-                "raw_score": 0.0
-            }
+        if self._is_too_short(text):
+            return dict(_NEUTRAL_SENTIMENT)
+        return self._analyze_sentiment_lower(text, text.strip().lower())
+    
+    def _analyze_sentiment_lower(self, text: str, text_lower: str) -> Dict:
+        """
+        analyze_sentiment for a non-short text, with text_lower the caller's
+        text.strip().lower() so it is computed only once per statement.
+        """
+        key = self._cache_key(text, text_lower)
+        cached = self._sentiment_cache.get(key)
+        if cached is None:
+            # Skip the model entirely when the keyword rules are conclusive
+            rule_result = self._rule_only_sentiment(text_lower)
+            if rule_result is not None:
+                cached = self._rule_sentiment(rule_result)
+            else:
+                # Get sentiment from model
+                result = self._run_model(text)[0]
+                cached = self._build_sentiment(result)
+            _bounded_put(self._sentiment_cache, key, cached)
+        
+        return dict(cached)
+    
+    def analyze_sentiment_batch(self, texts: List[str],
+                                texts_lower: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Analyze sentiment of several texts with batched model calls.
+        
+        Equivalent to [analyze_sentiment(t) for t in texts], but every text
+        that needs the model goes through the pipeline in one list call,
+        which the pipeline splits into batches of SENTIMENT_BATCH_SIZE.
+        Repeated statements are sent to the model only once.
+        
+        Args:
+            texts: Patient dialogue texts
+            texts_lower: Optional pre-computed t.strip().lower() for each text
+            
+        Returns:
+            List of sentiment dictionaries, in input order
+        """
+        if texts_lower is None:
+            texts_lower = [t.strip().lower() for t in texts]
         
-        # Get sentiment from model
-        result = self.sentiment_analyzer(text[:512])[0]  # Limit to 512 tokens
+        results = [None] * len(texts)
+        pending = {}  # cache key -> positions still waiting on the model
+        for i, (text, text_lower) in enumerate(zip(texts, texts_lower)):
+            if self._is_too_short(text):
+                results[i] = dict(_NEUTRAL_SENTIMENT)
+                continue
+            key = self._cache_key(text, text_lower)
+            cached = self._sentiment_cache.get(key)
+            if cached is not None:
+                results[i] = dict(cached)
+            elif key in pending:
+                pending[key].append(i)
+            else:
+                rule_result = self._rule_only_sentiment(text_lower)
+                if rule_result is not None:
+                    cached = self._rule_sentiment(rule_result)
+                    _bounded_put(self._sentiment_cache, key, cached)
+                    results[i] = dict(cached)
+                else:
+                    pending[key] = [i]
+        
+        # Only the statements the rules left undecided reach the model
+        if pending:
+            model_results = self._run_model(
+                [texts[positions[0]] for positions in pending.values()],
+                batch_size=SENTIMENT_BATCH_SIZE
+            )
+            for (key, positions), result in zip(pending.items(), model_results):
+                cached = self._build_sentiment(result)
+                _bounded_put(self._sentiment_cache, key, cached)
+                for i in positions:
+                    results[i] = dict(cached)
+        
+        return results
+    
+    def clear_cache(self):
+        """Forget all cached per-statement sentiment and intent results."""
+        self._sentiment_cache.clear()
+        self._intent_cache.clear()
+    
+    def _cache_key(self, text: str, text_lower: str) -> str:
+        """Normalized statement used as the sentiment-cache key."""
+        return text_lower if self._uncased else text.strip()
+    
+    def _run_model(self, inputs, **kwargs) -> List[Dict]:
+        """Run the sentiment pipeline without autograd bookkeeping."""
+        with self._model_lock, torch.inference_mode():
+            return self.sentiment_analyzer(inputs, **kwargs)
+    
+    @staticmethod
+    def _is_too_short(text: str) -> bool:
+        """Whether text is too short to be worth running through the model."""
+        return not text or len(text.strip()) < 3
+    
+    @staticmethod
+    def _rule_sentiment(sentiment: str) -> Dict:
+        """Sentiment dictionary for a statement decided by the keyword rules."""
+        return {
+            "sentiment": sentiment,
+            "confidence": 1.0,
+            "raw_label": "RULE",
+            "raw_score": 1.0
+        }
+    
+    def _build_sentiment(self, result: Dict) -> Dict:
+        """Map one raw pipeline result to the sentiment dictionary."""
+        # Models differ in label casing ("POSITIVE" vs "positive")
+        label = result['label'].upper()
         
         # Map to medical context
-        sentiment = self._map_to_medical_sentiment(result['label'], result['score'], text)
+        sentiment = self._map_to_medical_sentiment(label, result['score'])
         
         return {
             "sentiment": sentiment,
             "confidence": round(result['score'], 3),
-            "raw_label": result['label'],
+            "raw_label": label,
             "raw_score": round(result['score'], 3)
         }
     
-    def _map_to_medical_sentiment(self, label: str, score: float, text: str) -> str:
+    def _rule_only_sentiment(self, text_lower: str) -> Optional[str]:
         """
-        Map generic sentiment to medical context.
+        Decide medical sentiment from keyword rules alone.
         
         Args:
-            label: Sentiment label from model (POSITIVE/NEGATIVE)
-            score: Confidence score
-            text: Original text for context
+            text_lower: Lowercased patient text (surrounding whitespace is
+                        irrelevant to the rules)
             
         Returns:
-            Medical sentiment category
+            "Anxious" or "Reassured" when the rules are conclusive, otherwise
+            None (the model has to break the tie)
         """
-        text_lower = text.lower()
+        tokens = set(self._word_re.findall(text_lower))
         
-        # Helper to match whole words with boundaries
-        def _has_word(word_list, haystack):
-            return any(re.search(rf"\b{re.escape(w)}\b", haystack) for w in word_list)
-
         # Check for anxiety indicators (whole-word)
-        anxiety_words = ['worried', 'concern', 'concerned', 'anxious', 'nervous', 'scared', 'afraid']
-        has_anxiety = _has_word(anxiety_words, text_lower)
-        
-        # Handle simple negations that flip anxiety meaning (e.g., "not worried", "no longer worried")
-        negated_anxiety_patterns = [
-            r"not (worried|concerned|anxious|nervous|scared|afraid)",
-            r"no longer (worried|concerned|anxious|nervous|scared|afraid)",
-            r"hardly (worried|concerned|anxious|nervous|scared|afraid)",
-            r"doesn't make me (worried|concerned|anxious|nervous|scared|afraid)",
-            r"does not make me (worried|concerned|anxious|nervous|scared|afraid)"
-        ]
-        has_negation = any(re.search(p, text_lower) for p in negated_anxiety_patterns)
+        has_anxiety = not self._anxiety_words.isdisjoint(tokens)
+        
+        # Handle simple negations that flip anxiety meaning
+        has_negation = any(p.search(text_lower) for p in self._negated_anxiety_res)
         if has_negation:
             has_anxiety = False
         
         # Check for reassurance indicators
-        reassurance_words = ['better', 'good', 'relief', 'thank', 'appreciate', 'helpful', 'manageable', 'under control']
-        has_reassurance = _has_word(reassurance_words, text_lower)
-
-        # Additional recovery/normalcy cues that imply reassurance even with some negative phrasing
-        recovery_phrases = [
-            'back to my usual routine',
-            'back to my routine',
-            'back to normal',
-            'returned to normal',
-            "hasn't really stopped me",
-            "hasn't stopped me",
-            "didn't really stop me",
-            "didn't stop me",
-            'no longer',
-            'able to do everything',
-            'doing everything as usual',
-            'recovered',
-            'improved',
-            'improving',
-            'getting better',
-            'better now',
-            'feels fine now',
-            'okay now',
-            'normal now',
-            'back at work',
-            'back to work'
-        ]
-        has_recovery = any(phrase in text_lower for phrase in recovery_phrases)
+        has_reassurance = (
+            not self._reassurance_words.isdisjoint(tokens)
+            or self._reassurance_phrase_re.search(text_lower) is not None
+        )
+        
+        # Additional recovery/normalcy cues
+        has_recovery = self._recovery_re.search(text_lower) is not None
         
         # Apply revised decision rule:
         # 1) If explicit anxiety and no negation and no strong recovery/reassurance → Anxious
@@ -176,7 +492,22 @@ class SentimentIntentAnalyzer:
         # 2) Else if strong recovery/reassurance → Reassured
         if has_recovery or has_reassurance:
             return "Reassured"
-        # 3) Else fallback to model/Neutral (guard extremes)
+        return None
+    
+    def _map_to_medical_sentiment(self, label: str, score: float) -> str:
+        """
+        Map generic model sentiment to medical context.
+        
+        Only used when _rule_only_sentiment is inconclusive.
+        
+        Args:
+            label: Sentiment label from model (POSITIVE/NEGATIVE)
+            score: Confidence score
+            
+        Returns:
+            Medical sentiment category
+        """
+        # Fallback to model/Neutral (guard extremes)
         if label == 'NEGATIVE' and score > 0.9:
             return "Anxious"
         if label == 'POSITIVE' and score > 0.8:
@@ -193,22 +524,45 @@ class SentimentIntentAnalyzer:
         Returns:
             Detected intent category
         """
-        text_lower = text.lower()
+        return self._detect_intent_lower(text.strip().lower())
+    
+    def _detect_intent_lower(self, text_lower: str) -> str:
+        """
+        detect_intent for the caller's text.strip().lower().
+        
+        No intent pattern begins or ends with whitespace, so the stripped text
+        scores exactly like text.lower() and doubles as the cache key.
+        """
+        intent = self._intent_cache.get(text_lower)
+        if intent is not None:
+            return intent
         
         # Score each intent based on pattern matches
-        intent_scores = {}
-        for intent, patterns in self.intent_patterns.items():
-            score = 0
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    score += 1
-            intent_scores[intent] = score
+        scores = [len({m.lastgroup for m in rx.finditer(text_lower)}) for rx in self._intent_regexes]
+        
+        # Get the intent with highest score (first one wins ties)
+        best = max(scores)
+        if best > 0:
+            intent = self._intent_names[scores.index(best)]
+        else:
+            intent = "General conversation"
         
-        # Get the intent with highest score
-        if max(intent_scores.values()) > 0:
-            return max(intent_scores, key=intent_scores.get)
+        _bounded_put(self._intent_cache, text_lower, intent)
+        return intent
+    
+    def _analyze_pair(self, text: str) -> Tuple[Dict, str]:
+        """
+        Sentiment and intent of one statement, lowercasing it only once.
         
-        return "General conversation"
+        The cheap passes run first: intent regexes, then the cached / keyword
+        rule sentiment. The model is only invoked when both the cache and the
+        rules come up empty.
+        """
+        text_lower = text.strip().lower()
+        intent = self._detect_intent_lower(text_lower)
+        if self._is_too_short(text):
+            return dict(_NEUTRAL_SENTIMENT), intent
+        return self._analyze_sentiment_lower(text, text_lower), intent
     
     def detect_multiple_intents(self, text: str) -> List[str]:
         """
@@ -223,11 +577,9 @@ class SentimentIntentAnalyzer:
         text_lower = text.lower()
         detected_intents = []
         
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    detected_intents.append(intent)
-                    break
+        for intent, rx in self.intent_regex.items():
+            if rx.search(text_lower) is not None:
+                detected_intents.append(intent)
         
         return detected_intents if detected_intents else ["General conversation"]
     
@@ -244,34 +596,63 @@ class SentimentIntentAnalyzer:
         # Extract patient statements
         patient_statements = self._extract_patient_statements(conversation)
         
+        # Lowercase each statement once for both sentiment rules and intents
+        # (extracted statements are already stripped)
+        statements_lower = [s.lower() for s in patient_statements]
+        
+        # Run the model over all statements in batches rather than one by one
+        sentiments = self.analyze_sentiment_batch(patient_statements, statements_lower)
+        
         results = []
-        for statement in patient_statements:
-            sentiment = self.analyze_sentiment(statement)
-            intent = self.detect_intent(statement)
-            
-            results.append({
-                "statement": statement,
-                "sentiment": sentiment['sentiment'],
-                "confidence": sentiment['confidence'],
-                "intent": intent
-            })
+        for statement, statement_lower, sentiment in zip(patient_statements, statements_lower, sentiments):
+            intent = self._detect_intent_lower(statement_lower)
+            results.append(self._statement_result(statement, sentiment, intent))
         
         return results
     
-    def _extract_patient_statements(self, conversation: str) -> List[str]:
-        """Extract patient statements from conversation."""
-        lines = conversation.strip().split('\n')
-        patient_statements = []
+    def analyze_patient_dialogue_concurrent(self, conversation: str, max_workers: int = 2) -> List[Dict]:
+        """
+        Analyze each patient statement, overlapping model calls with other work.
         
-        for line in lines:
-            line = line.strip()
-            if line.lower().startswith('patient:'):
-                # Remove "Patient:" prefix
-                statement = line.split(':', 1)[1].strip()
-                if statement:
-                    patient_statements.append(statement)
+        Same result as analyze_patient_dialogue, for callers that cannot batch
+        (e.g. statements arriving one at a time): each statement's sentiment
+        runs on a thread pool while intents are detected on the calling
+        thread. Torch releases the GIL during the forward pass, so the rule
+        checks and regex scans proceed meanwhile.
         
-        return patient_statements
+        Args:
+            conversation: Full conversation transcript
+            max_workers: Size of the sentiment thread pool
+            
+        Returns:
+            List of analysis results for each patient statement
+        """
+        patient_statements = self._extract_patient_statements(conversation)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self.analyze_sentiment, s) for s in patient_statements]
+            intents = [self.detect_intent(s) for s in patient_statements]
+            sentiments = [f.result() for f in futures]
+        
+        return [
+            self._statement_result(statement, sentiment, intent)
+            for statement, sentiment, intent in zip(patient_statements, sentiments, intents)
+        ]
+    
+    @staticmethod
+    def _statement_result(statement: str, sentiment: Dict, intent: str) -> Dict:
+        """Per-statement entry returned by the dialogue analyzers."""
+        return {
+            "statement": statement,
+            "sentiment": sentiment['sentiment'],
+            "confidence": sentiment['confidence'],
+            "intent": intent
+        }
+    
+    def _extract_patient_statements(self, conversation: str) -> List[str]:
+        """Extract patient statements from conversation."""
+        # One sweep over the whole transcript
+        return [m.group(1) for m in PATIENT_LINE_RE.finditer(conversation)]
     
     def generate_overall_sentiment(self, conversation: str) -> Dict:
         """
@@ -293,18 +674,11 @@ class SentimentIntentAnalyzer:
                 "confidence": 0.0
             }
         
-        # Calculate sentiment distribution
-        sentiment_counts = {}
-        intent_counts = {}
-        total_confidence = 0
-        
-        for analysis in patient_analyses:
-            sentiment = analysis['sentiment']
-            intent = analysis['intent']
-            
-            sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-            intent_counts[intent] = intent_counts.get(intent, 0) + 1
-            total_confidence += analysis['confidence']
+        # Calculate sentiment distribution (Counter keeps first-seen order,
+        # so ties in max() below resolve the same way as before)
+        sentiment_counts = dict(Counter(a['sentiment'] for a in patient_analyses))
+        intent_counts = dict(Counter(a['intent'] for a in patient_analyses))
+        total_confidence = math.fsum(a['confidence'] for a in patient_analyses)
         
         # Determine overall sentiment
         overall_sentiment = max(sentiment_counts, key=sentiment_counts.get)
@@ -321,6 +695,16 @@ class SentimentIntentAnalyzer:
         }
 
 
+@lazy_singleton
+def _get_analyzer() -> SentimentIntentAnalyzer:
+    """
+    Return the shared SentimentIntentAnalyzer, loading it on first use.
+
+    Building the analyzer loads the DistilBERT pipeline (weights + tokenizer).
+    """
+    return SentimentIntentAnalyzer()
+
+
 def process_task2(statement: str) -> Dict:
     """
     Main function to process Task 2: Sentiment & Intent Analysis.
@@ -329,6 +713,9 @@ def process_task2(statement: str) -> Dict:
     1. Sentiment Classification using Transformer (DistilBERT)
     2. Intent Detection
     
+    Intent and the keyword sentiment rules are pure regex work and run
+    first; statements they decide never reach the transformer.
+    
     Args:
         statement: Single patient statement/dialogue
         
@@ -339,10 +726,9 @@ def process_task2(statement: str) -> Dict:
           "Intent": "Seeking reassurance"
         }
     """
-    analyzer = SentimentIntentAnalyzer()
+    analyzer = _get_analyzer()
     
-    sentiment = analyzer.analyze_sentiment(statement)
-    intent = analyzer.detect_intent(statement)
+    sentiment, intent = analyzer._analyze_pair(statement)
     
     return {
         "Sentiment": sentiment['sentiment'],
@@ -374,6 +760,9 @@ if __name__ == "__main__":
         # Default demo input
         statement = "I'm a bit worried about my back pain, but I hope it gets better soon."
 
+    # Load the model up front so its startup cost isn't counted in the analysis
+    _get_analyzer()
+
     print("=" * 80)
     print("TASK 2: SENTIMENT & INTENT ANALYSIS")
     print("=" * 80)
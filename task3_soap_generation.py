@@ -1,18 +1,176 @@
  
 
 import spacy
+from concurrent.futures import ProcessPoolExecutor
+import itertools
 import re
-from typing import Dict, List
-from task1_medical_ner import MedicalNER
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from shared_utils import PATIENT_LINE_RE, lazy_singleton, memoize_copies
+from task1_medical_ner import MedicalNER, _get_ner
+
+
+# History-of-present-illness clauses run from a lead word to the next '.',
+# optionally requiring a term in between. _find_clause walks them period by
+# period; a single '(lead)[^.]*term[^.]*\.' regex rescans to the end of the
+# text from every lead word and goes quadratic on long unpunctuated input.
+# Leads and terms are lowercase literals, located with str.find.
+_ACCIDENT_LEADS = ('car accident', 'accident')
+_PAIN_LEADS = ('experienced', 'feel', 'felt', 'had')
+_TREATMENT_LEADS = ('received', 'had', 'underwent')
+
+# Case-insensitive regex matching treats both Turkish capital dotted I and
+# small dotless i as 'i', but str.lower() does not (and lowercases the dotted
+# one to two characters). Folding them first keeps str.find results identical
+# to re.IGNORECASE and aligned with the original text.
+_CASE_FOLD_I = {0x130: 'i', 0x131: 'i'}
+
+# Every literal keyword the SOAP helpers look for in the lowercased transcript
+_KEYWORDS = (
+    # Subjective
+    'neck', 'back', 'accident', 'pain', 'treatment', 'therapy', 'improving', 'better', 'occasional',
+    # Objective
+    'physical examination', 'examination', 'range of motion', 'range of movement',
+    'no tenderness', 'tenderness', 'muscles', 'good', 'normal health', 'gait', 'distress',
+    'x-ray', 'no x-ray', "didn't do any x-rays",
+    # Assessment
+    'strain', 'severe', 'really bad', 'mild', 'full recovery', 'six months', 'progress',
+    'recovery', 'no long-term', 'positive', 'no signs', 'damage',
+    # Plan
+    'continue', 'painkiller', 'medication', 'come back', 'follow-up', 'worsening', 'worsen',
+    'reach out', 'contact', 'advice', 'no long-term impact',
+)
+
+# (keyword, longest other keyword inside it) pairs, shortest keyword first.
+# A keyword can only occur if the one inside it does (e.g. 'no x-ray' needs
+# 'x-ray'), so it is tested only after that one hits.
+_KEYWORD_TESTS = tuple(
+    (kw, max((other for other in _KEYWORDS if other != kw and other in kw), key=len, default=None))
+    for kw in sorted(_KEYWORDS, key=len)
+)
+
+# Symptom durations, matched on lowercased text; groups are (number, unit)
+_DURATION_RE = re.compile(r'(?:first|for|lasted|over)\s+(\d+)\s+(week|weeks|month|months)')
+
+
+# Only tok2vec + ner are kept in SOAPNoteGenerator.nlp; the rest are never
+# loaded
+_SOAP_EXCLUDED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+
+@lazy_singleton
+def _get_nlp():
+    """Return the shared general-purpose spaCy pipeline, loading it on first use."""
+    return spacy.load("en_core_web_sm", exclude=_SOAP_EXCLUDED_PIPES)
+
+
+def _keyword_hits(text_lower: str) -> FrozenSet[str]:
+    """Return the _KEYWORDS that occur in text_lower."""
+    hits = set()
+    for kw, inner in _KEYWORD_TESTS:
+        if (inner is None or inner in hits) and kw in text_lower:
+            hits.add(kw)
+    return frozenset(hits)
+
+
+def _fold_case(text: str, text_lower: str) -> str:
+    """Return text lowercased so that it lines up with text character for character."""
+    if '\u0130' in text or '\u0131' in text:
+        return text.translate(_CASE_FOLD_I).lower()
+    return text_lower
+
+
+def _find_clause(text: str, folded: str, leads: Tuple[str, ...],
+                 term: Optional[str] = None) -> Optional[str]:
+    """
+    Return the first clause from a lead word through the next '.'.
+    
+    With term, the clause must also contain term after the lead word. Same
+    result as a case-insensitive search for '(lead|...)[^.]*term[^.]*\.',
+    but each character is scanned a bounded number of times. folded is
+    _fold_case(text, ...).
+    """
+    # Next occurrence of each lead word; only refreshed once passed
+    next_at = [folded.find(lead) for lead in leads]
+    pos = 0
+    while True:
+        start = lead_end = -1
+        for i, lead in enumerate(leads):
+            at = next_at[i]
+            if 0 <= at < pos:
+                at = next_at[i] = folded.find(lead, pos)
+            if at >= 0 and (start < 0 or at < start):
+                start, lead_end = at, at + len(lead)
+        if start < 0:
+            return None
+        end = text.find('.', lead_end)
+        if end < 0:
+            return None
+        if term is None or folded.find(term, lead_end, end) >= 0:
+            return text[start:end + 1]
+        # Later lead words in this clause leave even less room for the term
+        pos = end + 1
+
+
+_RULE = "=" * 60
+_DIVIDER = "-" * 60
+
+
+def _format_section(title: str, section: Dict, spaced_keys: bool) -> str:
+    """Render one SOAP section as text, starting with a blank line."""
+    if spaced_keys:
+        lines = ''.join(f"\n{key.replace('_', ' ')}: {value}" for key, value in section.items())
+    else:
+        lines = ''.join(f"\n{key}: {value}" for key, value in section.items())
+    return f"\n\n{title}:\n{_DIVIDER}{lines}"
+
+
+@dataclass(frozen=True)
+class ConvFeatures:
+    """
+    Everything the SOAP sections read from one conversation, built in a
+    single pass by SOAPNoteGenerator._walk.
+    
+    Keyword presence is one frozenset rather than a boolean field per
+    keyword, so every helper check is a set lookup.
+    """
+    hits: FrozenSet[str]
+    entities: Dict[str, List[str]]
+    patient_statements: List[str]
+    history_parts: List[str]
+    durations: List[str]
 
 
 class SOAPNoteGenerator:
     """Generate structured SOAP notes from medical conversations."""
     
-    def __init__(self):
-        """Initialize SOAP note generator with NLP components."""
-        self.nlp = spacy.load("en_core_web_sm")
-        self.ner = MedicalNER()
+    def __init__(self, lazy_spacy: bool = True):
+        """
+        Initialize SOAP note generator with NLP components.
+        
+        Args:
+            lazy_spacy: Defer loading the MedicalNER spaCy pipeline until
+                        something asks for it (e.g. self.ner.extract_keywords).
+                        SOAP generation itself only uses the regex-based
+                        extract_entities, so it never triggers the load. Pass
+                        False to pay the load up front (warm servers)
+        """
+        # Process-wide instance shared with task 1. Its loaded pipeline is
+        # only read after loading, so sharing it across threads is safe
+        self.ner: MedicalNER = _get_ner()
+        if not lazy_spacy:
+            self.ner.nlp  # Accessing the property loads the pipeline now
+    
+    @property
+    def nlp(self):
+        """
+        General-purpose spaCy pipeline, loaded on first access.
+        
+        No SOAP helper needs it, so generators that never touch it skip the
+        model load entirely. The pipeline is shared by every generator in
+        the process. Only tok2vec and ner are loaded.
+        """
+        return _get_nlp()
     
     def generate_soap_note(self, conversation: str) -> Dict:
         """
@@ -24,11 +182,15 @@ class SOAPNoteGenerator:
         Returns:
             Structured SOAP note in JSON format
         """
+        # Every pass over the text happens here; the section builders
+        # below only format what it found
+        features = self._walk(conversation)
+        
         # Extract components
-        subjective = self._extract_subjective(conversation)
-        objective = self._extract_objective(conversation)
-        assessment = self._extract_assessment(conversation)
-        plan = self._extract_plan(conversation)
+        subjective = self._extract_subjective(features)
+        objective = self._extract_objective(features)
+        assessment = self._extract_assessment(features)
+        plan = self._extract_plan(features)
         
         soap_note = {
             "Subjective": subjective,
@@ -39,7 +201,43 @@ class SOAPNoteGenerator:
         
         return soap_note
     
-    def _extract_subjective(self, conversation: str) -> Dict:
+    def _walk(self, conversation: str) -> ConvFeatures:
+        """
+        Collect everything the SOAP sections report from one conversation.
+        
+        Returns:
+            ConvFeatures with the keyword hit-set, medical entities, the
+            first three patient statements, history-of-present-illness
+            clauses and symptom durations (e.g. "4 weeks")
+        """
+        # Lowercase once; every keyword check below reads this copy
+        text_lower = conversation.lower()
+        
+        # Test every keyword once; everything downstream only does set lookups
+        hits = _keyword_hits(text_lower)
+        
+        # History clauses, each searched only when its keyword is present
+        history_parts = []
+        if 'accident' in hits or 'pain' in hits or 'treatment' in hits or 'therapy' in hits:
+            folded = _fold_case(conversation, text_lower)
+            if 'accident' in hits:
+                history_parts.append(_find_clause(conversation, folded, _ACCIDENT_LEADS))
+            if 'pain' in hits:
+                history_parts.append(_find_clause(conversation, folded, _PAIN_LEADS, 'pain'))
+            if 'treatment' in hits or 'therapy' in hits:
+                history_parts.append(_find_clause(conversation, folded, _TREATMENT_LEADS, 'therapy'))
+        
+        return ConvFeatures(
+            hits=hits,
+            # Shared by the Subjective, Assessment and Plan sections
+            entities=self.ner.extract_entities(conversation, text_lower),
+            # Only the first three statements are reported
+            patient_statements=list(self._iter_patient_statements(conversation, 3)),
+            history_parts=[clause.strip() for clause in history_parts if clause],
+            durations=[f"{m[1]} {m[2]}" for m in _DURATION_RE.finditer(text_lower)],
+        )
+    
+    def _extract_subjective(self, features: ConvFeatures) -> Dict:
         """
         Extract Subjective section (patient's reported symptoms and history).
         
@@ -48,25 +246,25 @@ class SOAPNoteGenerator:
         - History of present illness
         - Patient's description of symptoms
         """
-        patient_statements = self._get_patient_statements(conversation)
+        hits = features.hits
         
         # Extract chief complaint (usually first symptom mentioned)
-        chief_complaint = self._extract_chief_complaint(conversation)
+        chief_complaint = self._extract_chief_complaint(hits, features.entities)
         
         # Extract history of present illness
-        history = self._extract_history_of_present_illness(conversation)
+        history = self._extract_history_of_present_illness(features.history_parts)
         
         # Extract symptom timeline
-        symptom_timeline = self._extract_symptom_timeline(conversation)
+        symptom_timeline = self._extract_symptom_timeline(features.durations, hits)
         
         return {
             "Chief_Complaint": chief_complaint,
             "History_of_Present_Illness": history,
             "Symptom_Timeline": symptom_timeline,
-            "Patient_Reported_Symptoms": patient_statements[:3] if patient_statements else []
+            "Patient_Reported_Symptoms": features.patient_statements
         }
     
-    def _extract_objective(self, conversation: str) -> Dict:
+    def _extract_objective(self, features: ConvFeatures) -> Dict:
         """
         Extract Objective section (observable and measurable findings).
         
@@ -75,14 +273,16 @@ class SOAPNoteGenerator:
         - Vital signs (if mentioned)
         - Observable conditions
         """
+        hits = features.hits
+        
         # Look for physical examination mentions
-        physical_exam = self._extract_physical_exam(conversation)
+        physical_exam = self._extract_physical_exam(hits)
         
         # Extract observable findings
-        observations = self._extract_observations(conversation)
+        observations = self._extract_observations(hits)
         
         # Extract any test results mentioned
-        test_results = self._extract_test_results(conversation)
+        test_results = self._extract_test_results(hits)
         
         return {
             "Physical_Exam": physical_exam,
@@ -90,7 +290,7 @@ class SOAPNoteGenerator:
             "Test_Results": test_results if test_results else "No tests mentioned"
         }
     
-    def _extract_assessment(self, conversation: str) -> Dict:
+    def _extract_assessment(self, features: ConvFeatures) -> Dict:
         """
         Extract Assessment section (diagnosis and clinical impression).
         
@@ -99,17 +299,19 @@ class SOAPNoteGenerator:
         - Severity
         - Prognosis
         """
+        hits = features.hits
+        
         # Extract diagnosis
-        diagnosis = self._extract_diagnosis(conversation)
+        diagnosis = self._extract_diagnosis(hits, features.entities)
         
         # Extract severity
-        severity = self._extract_severity(conversation)
+        severity = self._extract_severity(hits)
         
         # Extract prognosis
-        prognosis = self._extract_prognosis(conversation)
+        prognosis = self._extract_prognosis(hits)
         
         # Extract clinical impression
-        clinical_impression = self._extract_clinical_impression(conversation)
+        clinical_impression = self._extract_clinical_impression(hits)
         
         return {
             "Diagnosis": diagnosis,
@@ -118,7 +320,7 @@ class SOAPNoteGenerator:
             "Clinical_Impression": clinical_impression
         }
     
-    def _extract_plan(self, conversation: str) -> Dict:
+    def _extract_plan(self, features: ConvFeatures) -> Dict:
         """
         Extract Plan section (treatment plan and follow-up).
         
@@ -128,17 +330,19 @@ class SOAPNoteGenerator:
         - Follow-up instructions
         - Patient education
         """
+        hits = features.hits
+        
         # Extract treatment plan
-        treatment = self._extract_treatment_plan(conversation)
+        treatment = self._extract_treatment_plan(hits, features.entities)
         
         # Extract medications
-        medications = self._extract_medications(conversation)
+        medications = self._extract_medications(hits)
         
         # Extract follow-up instructions
-        follow_up = self._extract_follow_up(conversation)
+        follow_up = self._extract_follow_up(hits)
         
         # Extract patient education/advice
-        patient_education = self._extract_patient_education(conversation)
+        patient_education = self._extract_patient_education(hits)
         
         return {
             "Treatment": treatment,
@@ -148,125 +352,85 @@ class SOAPNoteGenerator:
         }
     
     # Helper methods for Subjective section
-    def _extract_chief_complaint(self, text: str) -> str:
+    def _extract_chief_complaint(self, hits: frozenset, entities: Dict) -> str:
         """Extract the main complaint."""
-        entities = self.ner.extract_entities(text)
         symptoms = entities.get('symptoms', [])
         
         if symptoms:
             # Prioritize neck and back pain
-            if 'neck' in text.lower() and 'back' in text.lower():
+            if 'neck' in hits and 'back' in hits:
                 return "Neck and back pain"
-            elif 'neck' in text.lower():
+            elif 'neck' in hits:
                 return "Neck pain"
-            elif 'back' in text.lower():
+            elif 'back' in hits:
                 return "Back pain"
             else:
                 return symptoms[0].capitalize()
         
         return "General discomfort"
     
-    def _extract_history_of_present_illness(self, text: str) -> str:
-        """Extract history of present illness."""
-        history_parts = []
-        
-        # Look for accident/incident description
-        if 'accident' in text.lower():
-            accident_match = re.search(
-                r'(car accident|accident)[^.]*\.',
-                text,
-                re.IGNORECASE
-            )
-            if accident_match:
-                history_parts.append(accident_match.group(0).strip())
-        
-        # Look for symptom onset
-        if 'pain' in text.lower():
-            pain_match = re.search(
-                r'(experienced|feel|felt|had)[^.]*pain[^.]*\.',
-                text,
-                re.IGNORECASE
-            )
-            if pain_match:
-                history_parts.append(pain_match.group(0).strip())
-        
-        # Look for treatment received
-        if 'treatment' in text.lower() or 'therapy' in text.lower():
-            treatment_match = re.search(
-                r'(received|had|underwent)[^.]*therapy[^.]*\.',
-                text,
-                re.IGNORECASE
-            )
-            if treatment_match:
-                history_parts.append(treatment_match.group(0).strip())
-        
+    def _extract_history_of_present_illness(self, history_parts: List[str]) -> str:
+        """Extract history of present illness (accident, onset, treatment clauses)."""
         return ' '.join(history_parts) if history_parts else "Patient reports ongoing symptoms."
     
-    def _extract_symptom_timeline(self, text: str) -> str:
+    def _extract_symptom_timeline(self, durations: List[str], hits: frozenset) -> str:
         """Extract timeline of symptoms."""
-        timeline_parts = []
-        
-        # Look for duration patterns
-        duration_pattern = r'(first|for|lasted|over)\s+(\d+)\s+(week|weeks|month|months)'
-        durations = re.findall(duration_pattern, text.lower())
-        
-        if durations:
-            for prefix, num, unit in durations:
-                timeline_parts.append(f"{num} {unit}")
+        # Durations arrive already formatted
+        timeline_parts = list(durations)
         
         # Look for improvement mentions
-        if 'improving' in text.lower() or 'better' in text.lower():
+        if 'improving' in hits or 'better' in hits:
             timeline_parts.append("showing improvement")
         
-        if 'occasional' in text.lower():
+        if 'occasional' in hits:
             timeline_parts.append("occasional symptoms currently")
         
         return ', '.join(timeline_parts) if timeline_parts else "Timeline not specified"
     
     # Helper methods for Objective section
-    def _extract_physical_exam(self, text: str) -> str:
+    def _extract_physical_exam(self, hits: frozenset) -> str:
         """Extract physical examination findings."""
         exam_findings = []
         
         # Look for examination mentions
-        if 'physical examination' in text.lower() or 'examination' in text.lower():
+        if 'physical examination' in hits or 'examination' in hits:
             # Look for range of motion
-            if 'range of motion' in text.lower() or 'range of movement' in text.lower():
+            if 'range of motion' in hits or 'range of movement' in hits:
                 exam_findings.append("Full range of motion in cervical and lumbar spine")
             
             # Look for tenderness
-            if 'no tenderness' in text.lower():
+            if 'no tenderness' in hits:
                 exam_findings.append("No tenderness on palpation")
-            elif 'tenderness' in text.lower():
+            elif 'tenderness' in hits:
                 exam_findings.append("Tenderness noted")
             
             # Look for muscle condition
-            if 'muscles' in text.lower() and 'good' in text.lower():
+            if 'muscles' in hits and 'good' in hits:
                 exam_findings.append("Muscles in good condition")
         
         return ', '.join(exam_findings) if exam_findings else "Physical examination completed"
     
-    def _extract_observations(self, text: str) -> str:
+    def _extract_observations(self, hits: frozenset) -> str:
         """Extract observable findings."""
         observations = []
         
         # Look for general appearance
-        if 'normal health' in text.lower():
+        if 'normal health' in hits:
             observations.append("Patient appears in normal health")
         
-        if 'gait' in text.lower():
+        if 'gait' in hits:
             observations.append("Normal gait observed")
         
         # Look for signs of distress
-        if 'distress' not in text.lower() and 'pain' in text.lower():
+        if 'distress' not in hits and 'pain' in hits:
             observations.append("No acute distress")
         
         return ', '.join(observations) if observations else "Patient appears comfortable"
     
-    def _extract_test_results(self, text: str) -> str:
+    def _extract_test_results(self, hits: frozenset) -> str:
         """Extract any test results mentioned."""
-        if 'x-ray' in text.lower():
-            if 'no x-ray' in text.lower() or "didn't do any x-rays" in text.lower():
+        if 'x-ray' in hits:
+            if 'no x-ray' in hits or "didn't do any x-rays" in hits:
                 return "No X-rays performed"
             else:
                 return "X-rays performed"
@@ -274,13 +438,12 @@ class SOAPNoteGenerator:
         return None
     
     # Helper methods for Assessment section
-    def _extract_diagnosis(self, text: str) -> str:
+    def _extract_diagnosis(self, hits: frozenset, entities: Dict) -> str:
         """Extract diagnosis."""
-        entities = self.ner.extract_entities(text)
         diagnoses = entities.get('diagnosis', [])
         
         if 'whiplash' in ' '.join(diagnoses):
-            if 'back' in text.lower() and 'strain' in text.lower():
+            if 'back' in hits and 'strain' in hits:
                 return "Whiplash injury and lower back strain"
             return "Whiplash injury"
         elif diagnoses:
@@ -288,112 +451,99 @@ class SOAPNoteGenerator:
         
         return "Post-traumatic musculoskeletal pain"
     
-    def _extract_severity(self, text: str) -> str:
+    def _extract_severity(self, hits: frozenset) -> str:
         """Extract severity of condition."""
-        text_lower = text.lower()
-        
-        if 'severe' in text_lower or 'really bad' in text_lower:
+        if 'severe' in hits or 'really bad' in hits:
             return "Moderate to severe initially, now mild"
-        elif 'mild' in text_lower or 'occasional' in text_lower:
+        elif 'mild' in hits or 'occasional' in hits:
             return "Mild, improving"
-        elif 'improving' in text_lower or 'better' in text_lower:
+        elif 'improving' in hits or 'better' in hits:
             return "Improving"
         
         return "Mild"
     
-    def _extract_prognosis(self, text: str) -> str:
+    def _extract_prognosis(self, hits: frozenset) -> str:
         """Extract prognosis."""
-        text_lower = text.lower()
-        
-        if 'full recovery' in text_lower:
-            if 'six months' in text_lower:
+        if 'full recovery' in hits:
+            if 'six months' in hits:
                 return "Full recovery expected within six months"
             return "Full recovery expected"
-        elif 'good' in text_lower and ('progress' in text_lower or 'recovery' in text_lower):
+        elif 'good' in hits and ('progress' in hits or 'recovery' in hits):
             return "Good prognosis"
-        elif 'no long-term' in text_lower:
+        elif 'no long-term' in hits:
             return "No long-term complications expected"
         
         return "Favorable prognosis"
     
-    def _extract_clinical_impression(self, text: str) -> str:
+    def _extract_clinical_impression(self, hits: frozenset) -> str:
         """Extract clinical impression."""
         impressions = []
         
-        if 'recovery' in text.lower() and 'positive' in text.lower():
+        if 'recovery' in hits and 'positive' in hits:
             impressions.append("Positive recovery trajectory")
         
-        if 'no signs' in text.lower() and 'damage' in text.lower():
+        if 'no signs' in hits and 'damage' in hits:
             impressions.append("No signs of lasting damage")
         
         return ', '.join(impressions) if impressions else "Patient responding well to treatment"
     
     # Helper methods for Plan section
-    def _extract_treatment_plan(self, text: str) -> str:
+    def _extract_treatment_plan(self, hits: frozenset, entities: Dict) -> str:
         """Extract treatment plan."""
         treatments = []
         
-        entities = self.ner.extract_entities(text)
-        treatment_list = entities.get('treatments', [])
+        # One substring test per keyword instead of a scan over the list;
+        # the space separator keeps matches from spanning two terms
+        treatment_text = ' '.join(entities.get('treatments', []))
         
-        if any('physio' in t for t in treatment_list):
-            if 'continue' in text.lower():
+        if 'physio' in treatment_text:
+            if 'continue' in hits:
                 treatments.append("Continue physiotherapy as needed")
             else:
                 treatments.append("Physiotherapy completed")
         
-        if any('painkiller' in t or 'analgesic' in t for t in treatment_list):
+        if 'painkiller' in treatment_text or 'analgesic' in treatment_text:
             treatments.append("Use analgesics for pain relief as needed")
         
         return ', '.join(treatments) if treatments else "Conservative management"
     
-    def _extract_medications(self, text: str) -> str:
+    def _extract_medications(self, hits: frozenset) -> str:
         """Extract medications."""
-        if 'painkiller' in text.lower():
+        if 'painkiller' in hits:
             return "Analgesics as needed for pain management"
-        elif 'medication' in text.lower():
+        elif 'medication' in hits:
             return "Medications as prescribed"
         
         return None
     
-    def _extract_follow_up(self, text: str) -> str:
+    def _extract_follow_up(self, hits: frozenset) -> str:
         """Extract follow-up instructions."""
-        text_lower = text.lower()
-        
-        if 'come back' in text_lower or 'follow-up' in text_lower:
-            if 'worsening' in text_lower or 'worsen' in text_lower:
+        if 'come back' in hits or 'follow-up' in hits:
+            if 'worsening' in hits or 'worsen' in hits:
                 return "Patient to return if pain worsens or persists beyond six months"
             return "Follow-up as needed"
-        elif 'reach out' in text_lower or 'contact' in text_lower:
+        elif 'reach out' in hits or 'contact' in hits:
             return "Patient advised to reach out if symptoms worsen"
         
         return "Follow-up in 3-6 months or as needed"
     
-    def _extract_patient_education(self, text: str) -> str:
+    def _extract_patient_education(self, hits: frozenset) -> str:
         """Extract patient education and advice."""
         education = []
         
-        if 'advice' in text.lower():
+        if 'advice' in hits:
             education.append("Patient counseled on injury management")
         
-        if 'no long-term impact' in text.lower():
+        if 'no long-term impact' in hits:
             education.append("Reassured about favorable prognosis")
         
         return ', '.join(education) if education else "Patient educated on condition and recovery expectations"
     
     # Utility methods
-    def _get_patient_statements(self, conversation: str) -> List[str]:
-        """Extract all patient statements."""
-        lines = conversation.strip().split('\n')
-        statements = []
-        
-        for line in lines:
-            if line.strip().lower().startswith('patient:'):
-                statement = line.split(':', 1)[1].strip()
-                if statement:
-                    statements.append(statement)
-        
-        return statements
+    def _iter_patient_statements(self, conversation: str, limit: Optional[int] = None) -> Iterator[str]:
+        """Yield patient statements in order, stopping after limit of them."""
+        matches = PATIENT_LINE_RE.finditer(conversation)
+        return (m.group(1) for m in itertools.islice(matches, limit))
     
     def format_soap_note_text(self, soap_note: Dict) -> str:
         """
@@ -405,38 +555,35 @@ class SOAPNoteGenerator:
         Returns:
             Formatted text version of SOAP note
         """
-        formatted = []
-        formatted.append("=" * 60)
-        formatted.append("SOAP NOTE")
-        formatted.append("=" * 60)
-        
-        # Subjective
-        formatted.append("\nSUBJECTIVE:")
-        formatted.append("-" * 60)
-        for key, value in soap_note['Subjective'].items():
-            formatted.append(f"{key.replace('_', ' ')}: {value}")
-        
-        # Objective
-        formatted.append("\nOBJECTIVE:")
-        formatted.append("-" * 60)
-        for key, value in soap_note['Objective'].items():
-            formatted.append(f"{key.replace('_', ' ')}: {value}")
-        
-        # Assessment
-        formatted.append("\nASSESSMENT:")
-        formatted.append("-" * 60)
-        for key, value in soap_note['Assessment'].items():
-            formatted.append(f"{key}: {value}")
-        
-        # Plan
-        formatted.append("\nPLAN:")
-        formatted.append("-" * 60)
-        for key, value in soap_note['Plan'].items():
-            formatted.append(f"{key}: {value}")
-        
-        formatted.append("\n" + "=" * 60)
-        
-        return '\n'.join(formatted)
+        # Subjective and Objective keys are shown with spaces; Assessment
+        # and Plan keep their underscores
+        return (
+            f"{_RULE}\nSOAP NOTE\n{_RULE}"
+            f"{_format_section('SUBJECTIVE', soap_note['Subjective'], True)}"
+            f"{_format_section('OBJECTIVE', soap_note['Objective'], True)}"
+            f"{_format_section('ASSESSMENT', soap_note['Assessment'], False)}"
+            f"{_format_section('PLAN', soap_note['Plan'], False)}"
+            f"\n\n{_RULE}"
+        )
+
+
+@lazy_singleton
+def _get_generator() -> SOAPNoteGenerator:
+    """
+    Return the shared SOAPNoteGenerator, building it on first use.
+
+    Every call shares the same generator (and its MedicalNER).
+    """
+    return SOAPNoteGenerator()
+
+
+@memoize_copies(maxsize=256)
+def _soap_cached(conversation: str) -> Tuple[Dict, str]:
+    """SOAP note for one conversation, together with its formatted text."""
+    generator = _get_generator()
+    
+    soap_note = generator.generate_soap_note(conversation)
+    return soap_note, generator.format_soap_note_text(soap_note)
 
 
 def process_task3(conversation: str) -> Dict:
@@ -449,10 +596,7 @@ def process_task3(conversation: str) -> Dict:
     Returns:
         Structured SOAP note
     """
-    generator = SOAPNoteGenerator()
-    
-    soap_note = generator.generate_soap_note(conversation)
-    formatted_text = generator.format_soap_note_text(soap_note)
+    soap_note, formatted_text = _soap_cached(conversation)
     
     result = {
         "task": "SOAP Note Generation",
@@ -463,6 +607,46 @@ def process_task3(conversation: str) -> Dict:
     return result
 
 
+def process_task3_batch(conversations: List[str]) -> List[Dict]:
+    """
+    Batch version of process_task3.
+    
+    Conversations are generated one after another on the calling thread.
+    A transcript that repeats, within this batch or from an earlier call,
+    is generated only once.
+    
+    Args:
+        conversations: Doctor-patient conversation transcripts
+        
+    Returns:
+        List of results in the process_task3 format, one per conversation
+    """
+    return [process_task3(conversation) for conversation in conversations]
+
+
+def process_task3_parallel(conversations: List[str], max_workers: Optional[int] = None,
+                           chunksize: int = 8) -> List[Dict]:
+    """
+    Parallel version of process_task3_batch for large corpora.
+    
+    Conversations are spread over a process pool, so the pure-Python
+    extraction runs on several cores instead of one GIL. Each worker builds
+    its shared generator once, when it starts, and keeps its own note cache.
+    For a handful of conversations process_task3_batch is faster, since
+    starting workers costs more than the work itself.
+    
+    Args:
+        conversations: Doctor-patient conversation transcripts
+        max_workers: Number of worker processes (default: CPU count)
+        chunksize: Conversations sent to a worker per round trip
+        
+    Returns:
+        List of results in the process_task3 format, in input order
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_get_generator) as pool:
+        return list(pool.map(process_task3, conversations, chunksize=chunksize))
+
+
 if __name__ == "__main__":
     # Example usage
     sample_conversation = """
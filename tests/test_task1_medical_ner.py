@@ -0,0 +1,30 @@
+import unittest
+
+from task1_medical_ner import MedicalNER
+
+
+class PrognosisSentenceTest(unittest.TestCase):
+    """Prognosis sentences are cut at sentence ends, not after honorifics."""
+
+    def setUp(self):
+        self.ner = MedicalNER()
+
+    def test_honorific_inside_prognosis_sentence(self):
+        for title in ("Mr.", "Ms.", "Mrs.", "Dr."):
+            with self.subTest(title=title):
+                text = f"{title} Jones, I expect a full recovery. Take care."
+                self.assertEqual(
+                    self.ner.extract_entities(text)['prognosis'],
+                    [f"{title} Jones, I expect a full recovery."]
+                )
+
+    def test_sentence_ending_in_a_name_still_splits(self):
+        text = "Thank you, Mr. Smith. I expect you will heal soon."
+        self.assertEqual(
+            self.ner.extract_entities(text)['prognosis'],
+            ["I expect you will heal soon."]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()